@@ -4,10 +4,11 @@ AI-Powered 3D Model Generator
 Uses Hugging Face Transformers and procedural generation for text-to-3D
 """
 
+import os
 import json
 import asyncio
-from datetime import datetime
-from pathlib import Path
+import contextlib
+from datetime import datetime, timezone
 import tempfile
 import numpy as np
 import math
@@ -598,17 +599,19 @@ class AI3DGenerator:
         try:
             # Generate AI-driven geometry
             vertices, faces = self._generate_ai_driven_geometry(prompt, format)
+            # One timestamp per export, shared by whichever header/metadata the format writes
+            generated_at = datetime.now(timezone.utc).isoformat()
             
             # Export to requested format
             if format.lower() == "glb":
-                await self._export_glb_with_ai(vertices, faces, prompt, output_path)
+                await self._export_glb_with_ai(vertices, faces, prompt, output_path, generated_at)
             elif format.lower() == "obj":
-                await self._export_obj_with_ai(vertices, faces, prompt, output_path)
+                await self._export_obj_with_ai(vertices, faces, prompt, output_path, generated_at)
             elif format.lower() == "ply":
-                await self._export_ply_with_ai(vertices, faces, prompt, output_path)
+                await self._export_ply_with_ai(vertices, faces, prompt, output_path, generated_at)
             else:
                 logger.warning("Unknown format, falling back to GLB", format=format)
-                await self._export_glb_with_ai(vertices, faces, prompt, output_path)
+                await self._export_glb_with_ai(vertices, faces, prompt, output_path, generated_at)
             
             logger.info("AI 3D generation completed successfully", job_id=job_id, format=format)
             return output_path
@@ -617,19 +620,19 @@ class AI3DGenerator:
             logger.error("Failed to generate 3D model with AI", job_id=job_id, error=str(e))
             raise
     
-    async def _export_glb_with_ai(self, vertices, faces, prompt, output_path):
+    async def _export_glb_with_ai(self, vertices, faces, prompt, output_path, generated_at: str):
         """Export AI-generated geometry to GLB format."""
         # Create enhanced GLB with AI metadata
-        glb_content = self._create_ai_glb(vertices, faces, prompt)
+        glb_content = self._create_ai_glb(vertices, faces, prompt, generated_at)
         with open(output_path, 'wb') as f:
             f.write(glb_content)
         logger.info("AI GLB export completed", path=output_path)
     
-    async def _export_obj_with_ai(self, vertices, faces, prompt, output_path):
+    async def _export_obj_with_ai(self, vertices, faces, prompt, output_path, generated_at: str):
         """Export AI-generated geometry to OBJ format."""
         with open(output_path, 'w') as f:
             f.write(f"# AI-Generated 3D model for prompt: {prompt}\n")
-            f.write(f"# Generated at: {datetime.utcnow().isoformat()}\n")
+            f.write(f"# Generated at: {generated_at}\n")
             f.write(f"# Vertices: {len(vertices)}, Faces: {len(faces)}\n\n")
             
             for v in vertices:
@@ -640,13 +643,13 @@ class AI3DGenerator:
         
         logger.info("AI OBJ export completed", path=output_path)
     
-    async def _export_ply_with_ai(self, vertices, faces, prompt, output_path):
+    async def _export_ply_with_ai(self, vertices, faces, prompt, output_path, generated_at: str):
         """Export AI-generated geometry to PLY format."""
         with open(output_path, 'w') as f:
             f.write("ply\n")
             f.write("format ascii 1.0\n")
             f.write(f"comment AI-Generated 3D model for prompt: {prompt}\n")
-            f.write(f"comment Generated at: {datetime.utcnow().isoformat()}\n")
+            f.write(f"comment Generated at: {generated_at}\n")
             f.write(f"element vertex {len(vertices)}\n")
             f.write("property float x\n")
             f.write("property float y\n")
@@ -663,7 +666,7 @@ class AI3DGenerator:
         
         logger.info("AI PLY export completed", path=output_path)
     
-    def _create_ai_glb(self, vertices, faces, prompt):
+    def _create_ai_glb(self, vertices, faces, prompt, generated_at: str):
         """Create GLB with AI-generated geometry."""
         # Enhanced GLB with actual geometry data
         header = b'glTF'
@@ -706,7 +709,7 @@ class AI3DGenerator:
             ],
             "buffers": [{"byteLength": len(vertex_data) + len(face_data)}],
             "_ai_prompt": prompt,
-            "_generated_at": datetime.utcnow().isoformat()
+            "_generated_at": generated_at
         }
         
         json_str = json.dumps(json_data, separators=(',', ':'))
@@ -777,15 +780,15 @@ class AI3DGenerator:
     async def generate_and_upload_file(self, job_id: str, prompt: str, format: str = "glb") -> dict:
         """Generate AI-powered 3D file and upload to MinIO storage."""
         
-        with tempfile.NamedTemporaryFile(suffix=f'.{format}', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
+        # Keep the descriptor open so the size comes from fstat on it, not another path lookup
+        fd, tmp_path = tempfile.mkstemp(suffix=f'.{format}')
             
         try:
             # Generate AI-powered 3D model
             await self.generate_3d_from_text(job_id, prompt, tmp_path, format)
             
             # Get file size
-            file_size = Path(tmp_path).stat().st_size
+            file_size = os.fstat(fd).st_size
             
             # Upload to MinIO
             filename = f"{job_id}_model.{format}"
@@ -800,7 +803,9 @@ class AI3DGenerator:
             
         finally:
             # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
+            os.close(fd)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
 
 
 async def main():
@@ -0,0 +1,34 @@
+"""
+Helpers shared by the worker file generators
+"""
+
+import json
+import contextlib
+
+# orjson serializes straight to compact UTF-8 bytes; fall back to the stdlib encoder
+try:
+    import orjson
+    
+    def encode_json(obj) -> bytes:
+        """Serialize obj as compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+except ImportError:
+    def encode_json(obj) -> bytes:
+        """Serialize obj as compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Public-read bucket policy, formatted with the bucket name
+PUBLIC_READ_POLICY_TEMPLATE = (
+    '{"Version":"2012-10-17","Statement":[{"Effect":"Allow","Principal":{"AWS":"*"},'
+    '"Action":["s3:GetObject"],"Resource":["arn:aws:s3:::%s/*"]}]}'
+)
+
+
+@contextlib.contextmanager
+def open_sink(sink, buffering=-1):
+    """Open an output path for binary writing, or yield an already-open binary buffer without closing it."""
+    if hasattr(sink, 'write'):
+        yield sink
+    else:
+        with open(sink, 'wb', buffering=buffering) as f:
+            yield f
@@ -3,27 +3,97 @@
 File Generator - creates actual 3D model files and uploads to MinIO
 """
 
-import json
+import io
+import os
+import time
+import struct
 import asyncio
-from datetime import datetime
-from pathlib import Path
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import tempfile
 from minio import Minio
 from minio.error import S3Error
+import urllib3
 import structlog
 
+from .common import encode_json, PUBLIC_READ_POLICY_TEMPLATE
+
 logger = structlog.get_logger(__name__)
 
+# Invariant GLB pieces, built once at import instead of per file
+# Binary chunk (minimal vertex data): one triangle, 3 x VEC3 float32 = 36 bytes,
+# matching the byteLength declared in the JSON chunk (already 4-byte aligned)
+_BIN_DATA = struct.pack('<9f', 0.0, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 1.0)
+assert len(_BIN_DATA) == 36
+_BIN_CHUNK_HDR = struct.pack('<I4s', len(_BIN_DATA), b'BIN\x00')
+_BIN_CHUNK = _BIN_CHUNK_HDR + _BIN_DATA
+
+# Fixed glTF structure of the mock GLB, serialized once without its closing brace;
+# only the prompt and timestamp are encoded per file
+_GLB_JSON_PREFIX = encode_json({
+    "asset": {"version": "2.0"},
+    "scenes": [{"nodes": [0]}],
+    "nodes": [{"mesh": 0}],
+    "meshes": [{"primitives": [{"attributes": {"POSITION": 0}}]}],
+    "accessors": [{"bufferView": 0, "componentType": 5126, "count": 3, "type": "VEC3"}],
+    "bufferViews": [{"buffer": 0, "byteLength": 36, "target": 34962}],
+    "buffers": [{"byteLength": 36}],
+})[:-1]
+_MINIMAL_GLB_JSON_PREFIX = encode_json({
+    "asset": {"version": "2.0"},
+    "scenes": [{"nodes": [0]}],
+    "nodes": [{}],
+})[:-1]
+
+# MinIO multipart part size; large parts keep multipart throughput near line rate
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+
+# Buffers below this size go up as one presigned PUT instead of through put_object
+PRESIGNED_PUT_MAX_SIZE = 5 * 1024 * 1024
+PRESIGNED_PUT_EXPIRY = timedelta(minutes=5)
+
+# Placeholder outputs stay in memory up to this size before spilling to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Upload concurrency: at most UPLOAD_CONCURRENCY uploads in flight per generator,
+# run on a dedicated pool sized to MinIO's MINIO_API_REQUESTS_MAX headroom
+UPLOAD_CONCURRENCY = 8
+UPLOAD_WORKERS = 16
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="minio-upload")
+
 class FileGenerator:
     """Generates actual 3D model files and uploads to MinIO."""
     
     def __init__(self, minio_endpoint="minio:9000", access_key="minioadmin", secret_key="minioadmin"):
+        # One connection pool for the client's own calls and the presigned PUTs, sized to the upload pool
+        self._http = urllib3.PoolManager(
+            maxsize=UPLOAD_WORKERS,
+            timeout=urllib3.Timeout(connect=300, read=300),
+            retries=urllib3.Retry(total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]),
+        )
         self.minio_client = Minio(
             minio_endpoint,
             access_key=access_key,
             secret_key=secret_key,
-            secure=False
+            secure=False,
+            http_client=self._http,
         )
+        # Buckets already verified/created; steady-state uploads skip the existence check
+        self._known_buckets: set[str] = set()
+        self._bucket_lock = asyncio.Lock()
+        self._upload_sem = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+        # Second-precision UTC timestamp, refreshed at most once per second
+        self._ts = ""
+        self._ts_at = float("-inf")
+    
+    def _timestamp(self) -> str:
+        """Current UTC time as ISO 8601 (seconds precision), cached for ~1s."""
+        now = time.monotonic()
+        if now - self._ts_at > 1.0:
+            self._ts = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            self._ts_at = now
+        return self._ts
         
     async def generate_glb_file(self, job_id: str, prompt: str, output_path: str) -> str:
         """Generate a simple GLB file (mock implementation)."""
@@ -31,79 +101,93 @@ class FileGenerator:
         # Create a simple GLB file with basic content
         glb_content = self.create_mock_glb("", prompt)
         
-        # Write to file
-        with open(output_path, 'wb') as f:
-            f.write(glb_content)
+        # Write to file - unbuffered, straight from the bytearray with no intermediate bytes copy
+        with open(output_path, 'wb', buffering=0) as f:
+            view = memoryview(glb_content)
+            while view:
+                view = view[f.write(view):]
             
         return output_path
     
-    def create_mock_glb(self, job_id: str, prompt: str) -> bytes:
-        """Create a mock GLB file content."""
-        # This is a very basic mock - in reality you'd generate actual 3D content
-        header = b'glTF'  # GLB header
-        version = (2).to_bytes(4, 'little')
-        length = (1000).to_bytes(4, 'little')  # File length
+    def create_mock_glb(self, job_id: str, prompt: str, minimal: bool = False) -> bytearray:
+        """Create a mock GLB file content.
         
-        # JSON chunk
-        json_data = {
-            "asset": {"version": "2.0"},
-            "scenes": [{"nodes": [0]}],
-            "nodes": [{"mesh": 0}],
-            "meshes": [{"primitives": [{"attributes": {"POSITION": 0}}]}],
-            "accessors": [{"bufferView": 0, "componentType": 5126, "count": 3, "type": "VEC3"}],
-            "bufferViews": [{"buffer": 0, "byteLength": 36, "target": 34962}],
-            "buffers": [{"byteLength": 36}],
-            "_prompt": prompt,
-            "_generated_at": datetime.utcnow().isoformat()
-        }
-        
-        json_str = json.dumps(json_data, separators=(',', ':'))
-        json_bytes = json_str.encode('utf-8')
-        
-        # Pad to 4-byte boundary
-        padding = b'\x00' * (4 - (len(json_bytes) % 4)) if len(json_bytes) % 4 else b''
-        json_bytes += padding
-        
-        json_chunk_length = len(json_bytes).to_bytes(4, 'little')
-        json_chunk_type = b'JSON'
+        With ``minimal`` the GLB carries only the JSON chunk: an empty scene
+        node and no mesh, accessor, buffer view or BIN chunk.
+        """
+        # This is a very basic mock - in reality you'd generate actual 3D content
+        # JSON chunk: frozen structure plus the escaped prompt and timestamp
+        json_bytes = b''.join((
+            _MINIMAL_GLB_JSON_PREFIX if minimal else _GLB_JSON_PREFIX,
+            b',"_prompt":', encode_json(prompt),
+            b',"_generated_at":', encode_json(self._timestamp()),
+            b'}',
+        ))
         
-        # Binary chunk (minimal vertex data)
-        binary_data = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80?\x00\x00\x80?\x00\x00\x00\x00\x00\x00\x80?\x00\x00\x80?\x00\x00\x80?'
-        binary_chunk_length = len(binary_data).to_bytes(4, 'little')
-        binary_chunk_type = b'BIN\x00'
+        # Pad to 4-byte boundary (the glTF spec pads the JSON chunk with spaces)
+        pad = -len(json_bytes) & 3
+        if pad:
+            json_bytes += b' ' * pad
         
-        # Combine all parts
-        glb_data = (header + version + length + 
-                   json_chunk_length + json_chunk_type + json_bytes +
-                   binary_chunk_length + binary_chunk_type + binary_data)
+        # Combine all parts into one preallocated buffer
+        json_end = 20 + len(json_bytes)
+        total_length = json_end if minimal else json_end + len(_BIN_CHUNK)
+        glb_data = bytearray(total_length)
+        struct.pack_into('<4sII', glb_data, 0, b'glTF', 2, total_length)
+        struct.pack_into('<I4s', glb_data, 12, len(json_bytes), b'JSON')
+        glb_data[20:json_end] = json_bytes
+        if not minimal:
+            glb_data[json_end:] = _BIN_CHUNK
         
         return glb_data
     
-    async def upload_to_minio(self, job_id: str, file_path: str, filename: str) -> str:
-        """Upload file to MinIO and return public URL."""
+    async def _run_upload(self, func, *args):
+        """Run a blocking upload call on the upload pool, bounded by the semaphore."""
+        async with self._upload_sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_upload_executor, functools.partial(func, *args))
+    
+    async def _ensure_bucket(self, bucket_name: str):
+        """Create the bucket with a public read policy once; later calls are a set lookup."""
+        if bucket_name in self._known_buckets:
+            return
+        
+        # Serialize first-time checks so concurrent jobs don't race to create the bucket
+        async with self._bucket_lock:
+            if bucket_name in self._known_buckets:
+                return
+            
+            if not await asyncio.to_thread(self.minio_client.bucket_exists, bucket_name):
+                await asyncio.to_thread(self.minio_client.make_bucket, bucket_name)
+                # Set public read policy
+                await asyncio.to_thread(self.minio_client.set_bucket_policy, bucket_name, PUBLIC_READ_POLICY_TEMPLATE % bucket_name)
+            
+            self._known_buckets.add(bucket_name)
+    
+    def _put_file(self, bucket_name: str, object_name: str, file_path: str, file_size: int | None):
+        """Stream a file from an open handle; the size is taken from the handle if not given."""
+        with open(file_path, 'rb') as data:
+            if file_size is None:
+                file_size = os.fstat(data.fileno()).st_size
+            self.minio_client.put_object(
+                bucket_name, object_name, data, length=file_size, part_size=UPLOAD_PART_SIZE
+            )
+    
+    async def upload_to_minio(self, job_id: str, file_path: str, filename: str,
+                              file_size: int | None = None) -> str:
+        """Upload file to MinIO and return public URL.
+        
+        Pass ``file_size`` when the caller already knows it to skip the stat.
+        """
         try:
             bucket_name = "trellis-output"
             object_name = f"{job_id}/{filename}"
             
             # Ensure bucket exists
-            if not self.minio_client.bucket_exists(bucket_name):
-                self.minio_client.make_bucket(bucket_name)
-                # Set public read policy
-                policy = {
-                    "Version": "2012-10-17",
-                    "Statement": [
-                        {
-                            "Effect": "Allow",
-                            "Principal": {"AWS": "*"},
-                            "Action": ["s3:GetObject"],
-                            "Resource": [f"arn:aws:s3:::{bucket_name}/*"]
-                        }
-                    ]
-                }
-                self.minio_client.set_bucket_policy(bucket_name, json.dumps(policy))
-            
-            # Upload file
-            self.minio_client.fput_object(bucket_name, object_name, file_path)
+            await self._ensure_bucket(bucket_name)
+            
+            # Upload file (blocking client call runs in a worker thread)
+            await self._run_upload(self._put_file, bucket_name, object_name, file_path, file_size)
             
             # Return public URL
             public_url = f"http://localhost:9100/{bucket_name}/{object_name}"
@@ -121,52 +205,137 @@ class FileGenerator:
             logger.error("Failed to upload to MinIO", job_id=job_id, error=str(e))
             raise
     
-    async def generate_and_upload_file(self, job_id: str, prompt: str, format: str = "glb") -> dict:
-        """Generate 3D file and upload to MinIO storage."""
-        
-        with tempfile.NamedTemporaryFile(suffix=f'.{format}', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            
+    def _presigned_put(self, bucket_name: str, object_name: str, data):
+        """Upload a small bytes-like buffer as a single PUT against a presigned URL, without copying it."""
+        url = self.minio_client.presigned_put_object(
+            bucket_name, object_name, expires=PRESIGNED_PUT_EXPIRY
+        )
+        response = self._http.request(
+            "PUT", url, body=data, headers={"Content-Length": str(len(data))}
+        )
+        if response.status >= 300:
+            raise urllib3.exceptions.HTTPError(
+                f"Presigned PUT failed with status {response.status}: {response.data[:200]!r}"
+            )
+    
+    async def upload_buffer_to_minio(self, job_id: str, data: bytes, filename: str) -> str:
+        """Upload in-memory bytes to MinIO and return public URL."""
         try:
-            # Generate the file
-            if format.lower() == "glb":
-                await self.generate_glb_file(job_id, prompt, tmp_path)
+            bucket_name = "trellis-output"
+            object_name = f"{job_id}/{filename}"
+            
+            # Ensure bucket exists
+            await self._ensure_bucket(bucket_name)
+            
+            # Upload buffer directly - no temp file write/re-read
+            if len(data) < PRESIGNED_PUT_MAX_SIZE:
+                await self._run_upload(self._presigned_put, bucket_name, object_name, data)
             else:
-                # For other formats, create a placeholder
-                with open(tmp_path, 'w') as f:
-                    f.write(f"# 3D Model generated from prompt: {prompt}\n")
-                    f.write(f"# Job ID: {job_id}\n")
-                    f.write(f"# Format: {format}\n")
-                    f.write(f"# Generated at: {datetime.utcnow().isoformat()}\n")
+                await self._run_upload(
+                    self.minio_client.put_object, bucket_name, object_name, io.BytesIO(data), len(data)
+                )
             
-            # Get file size
-            file_size = Path(tmp_path).stat().st_size
+            # Return public URL
+            public_url = f"http://localhost:9100/{bucket_name}/{object_name}"
             
-            # Upload to MinIO
-            filename = f"{job_id}_model.{format}"
-            public_url = await self.upload_to_minio(job_id, tmp_path, filename)
+            logger.info(
+                "Buffer uploaded to MinIO",
+                job_id=job_id,
+                filename=filename,
+                url=public_url
+            )
+            
+            return public_url
+            
+        except (S3Error, urllib3.exceptions.HTTPError) as e:
+            logger.error("Failed to upload to MinIO", job_id=job_id, error=str(e))
+            raise
+    
+    async def upload_stream_to_minio(self, job_id: str, stream, length: int, filename: str) -> str:
+        """Upload a readable file object of known length to MinIO and return public URL."""
+        try:
+            bucket_name = "trellis-output"
+            object_name = f"{job_id}/{filename}"
+            
+            # Ensure bucket exists
+            await self._ensure_bucket(bucket_name)
+            
+            await self._run_upload(
+                functools.partial(self.minio_client.put_object, part_size=UPLOAD_PART_SIZE),
+                bucket_name, object_name, stream, length
+            )
+            
+            # Return public URL
+            public_url = f"http://localhost:9100/{bucket_name}/{object_name}"
+            
+            logger.info(
+                "Stream uploaded to MinIO",
+                job_id=job_id,
+                filename=filename,
+                url=public_url
+            )
+            
+            return public_url
+            
+        except S3Error as e:
+            logger.error("Failed to upload to MinIO", job_id=job_id, error=str(e))
+            raise
+    
+    async def generate_and_upload_file(self, job_id: str, prompt: str, format: str = "glb",
+                                       minimal: bool = False) -> dict:
+        """Generate 3D file and upload to MinIO storage.
+        
+        ``minimal`` emits a JSON-only GLB; it has no effect on other formats.
+        """
+        filename = f"{job_id}_model.{format}"
+        
+        if format.lower() == "glb":
+            # GLB is built in memory - upload it straight from the buffer
+            glb_content = self.create_mock_glb(job_id, prompt, minimal)
+            public_url = await self.upload_buffer_to_minio(job_id, glb_content, filename)
             
             return {
                 "format": format,
                 "url": public_url,
-                "size_bytes": file_size,
+                "size_bytes": len(glb_content),
                 "filename": filename
             }
+        
+        # For other formats, create a placeholder; it stays in RAM unless it outgrows the spool
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, suffix=f'.{format}') as tmp_file:
+            tmp_file.write(
+                f"# 3D Model generated from prompt: {prompt}\n"
+                f"# Job ID: {job_id}\n"
+                f"# Format: {format}\n"
+                f"# Generated at: {self._timestamp()}\n".encode()
+            )
+            file_size = tmp_file.tell()
+            tmp_file.seek(0)
             
-        finally:
-            # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
+            # Upload to MinIO
+            public_url = await self.upload_stream_to_minio(job_id, tmp_file, file_size, filename)
+        
+        return {
+            "format": format,
+            "url": public_url,
+            "size_bytes": file_size,
+            "filename": filename
+        }
 
 
 async def main():
     """Test the file generator."""
     generator = FileGenerator()
     
-    test_job_id = "test-job-123"
     test_prompt = "A beautiful red dragon"
     
-    result = await generator.generate_and_upload_file(test_job_id, test_prompt)
-    print(f"Generated file: {result}")
+    # Jobs run concurrently; uploads are bounded by the generator's semaphore
+    results = await asyncio.gather(*(
+        generator.generate_and_upload_file(f"test-job-{i}", test_prompt, fmt)
+        for i, fmt in enumerate(("glb", "obj", "ply"))
+    ))
+    for result in results:
+        print(f"Generated file: {result}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Procedural fallback shapes - keyword-driven meshes used when TRELLIS is unavailable.
+
+TrellisFileGenerator imports this module lazily, so workers that only ever run
+TRELLIS never load the generator tables. The entry points are
+simple_shape_kind and build_simple_shape.
+"""
+
+import math
+import re
+import functools
+import numpy as np
+
+# Fallback shape keyword -> (priority, shape kind); the lowest priority among matches wins
+SIMPLE_SHAPE_TABLE = {
+    'dragon': (0, 'dragon'),
+    'robot': (1, 'robot'),
+    'cat': (2, 'creature'), 'animal': (2, 'creature'),
+    'car': (3, 'vehicle'), 'vehicle': (3, 'vehicle'),
+    'house': (4, 'building'), 'building': (4, 'building'),
+}
+
+# Static fallback meshes (vertices, faces); None is the default triangle
+SIMPLE_MESHES = {
+    'vehicle': (
+        (
+            (-2, -1, 0), (2, -1, 0), (2, 1, 0), (-2, 1, 0),  # Bottom
+            (-2, -1, 1), (2, -1, 1), (2, 1, 1), (-2, 1, 1),  # Top
+        ),
+        (
+            (0, 1, 2), (0, 2, 3),  # Bottom
+            (4, 7, 6), (4, 6, 5),  # Top
+            (0, 4, 5), (0, 5, 1),  # Sides
+            (1, 5, 6), (1, 6, 2),
+            (2, 6, 7), (2, 7, 3),
+            (3, 7, 4), (3, 4, 0),
+        ),
+    ),
+    'building': (
+        (
+            (-2, -2, 0), (2, -2, 0), (2, 2, 0), (-2, 2, 0),  # Base
+            (-2, -2, 2), (2, -2, 2), (2, 2, 2), (-2, 2, 2),  # Walls
+            (0, -2, 3), (0, 2, 3),  # Roof peak
+        ),
+        (
+            (0, 1, 2), (0, 2, 3),  # Floor
+            (4, 7, 6), (4, 6, 5),  # Ceiling
+            (0, 4, 5), (0, 5, 1),  # Walls
+            (1, 5, 6), (1, 6, 2),
+            (2, 6, 7), (2, 7, 3),
+            (3, 7, 4), (3, 4, 0),
+            (4, 8, 5), (5, 8, 6),  # Roof
+            (6, 9, 7), (7, 9, 4),
+            (8, 9, 6), (8, 6, 5),
+        ),
+    ),
+    None: (((0, 0, 0), (1, 0, 0), (0.5, 1, 0)), ((0, 1, 2),)),  # Default simple triangle
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _prompt_tokens(prompt_lower):
+    """Tokenize a lowercased prompt once into a frozenset of alphanumeric words."""
+    return frozenset(re.findall(r'[a-z0-9]+', prompt_lower))
+
+
+# Twelve triangles of an axis-aligned box whose 8 corners are bottom ring then top ring
+_CUBE_FACES = np.array([
+    (0, 1, 2), (0, 2, 3),  # Bottom
+    (4, 7, 6), (4, 6, 5),  # Top
+    (0, 4, 5), (0, 5, 1),  # Sides
+    (1, 5, 6), (1, 6, 2),
+    (2, 6, 7), (2, 7, 3),
+    (3, 7, 4), (3, 4, 0),
+], dtype=np.int32)
+
+# Corner signs of a unit box in the same bottom-ring/top-ring order as _CUBE_FACES
+_CUBE_CORNERS = np.array([
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+])
+
+# _CUBE_FACES reordered bottom/top/front/back/left/right, the order the detailed shapes emit box sides in
+_BOX_FACES = _CUBE_FACES[[0, 1, 2, 3, 4, 5, 8, 9, 10, 11, 6, 7]]
+
+def _boxes(bounds):
+    """Vertices (8 per box) and faces of axis-aligned boxes given as ((min x, y, z), (max x, y, z)) pairs."""
+    bounds = np.asarray(bounds, dtype=np.float64)
+    vertices = np.where(_CUBE_CORNERS > 0, bounds[:, None, 1], bounds[:, None, 0]).reshape(-1, 3)
+    faces = (np.arange(len(bounds), dtype=np.int32)[:, None, None] * 8 + _BOX_FACES).reshape(-1, 3)
+    return vertices, faces
+
+
+class ProceduralShapeGenerator:
+    """Generates procedural meshes as (vertices, faces) from prompt keywords."""
+    
+    def _generate_simple_creature(self, creature_type, complexity):
+        """Generate simple creature shapes."""
+        # Simple creature - elongated body, three interleaved vertices per cross-section
+        t = np.arange(10) / 9
+        x = t * 4.0 - 2.0  # Body along X axis
+        y = np.sin(t * math.pi) * 1.0  # Body width
+        z = np.sin(t * math.pi * 2) * 0.5  # Some vertical variation
+        
+        vertices = np.empty((30, 3))
+        vertices[0::3] = np.column_stack([x, y, z])
+        vertices[1::3] = np.column_stack([x, -y, z])
+        vertices[2::3] = np.column_stack([x, np.zeros_like(x), z + 1.0])  # Top ridge
+        
+        # Simple triangular faces
+        starts = np.arange(0, len(vertices) - 3, 3, dtype=np.int32)
+        faces = starts[:, None] + np.arange(3, dtype=np.int32)
+        
+        return vertices, faces
+
+    def _generate_detailed_dragon(self, complexity, material_properties, color_influence, context):
+        """Generate an extremely simple, clearly recognizable dragon shape."""
+        scale = 1.0  # Keep it simple
+        
+        # BODY: Simple elongated box (main dragon body)
+        body_length = 6.0 * scale
+        body_width = 2.0 * scale
+        body_height = 1.5 * scale
+        
+        # HEAD: Simple larger box at front
+        head_size = 1.8 * scale
+        head_x = -body_length/2 - head_size/2  # In front of body
+        
+        # TAIL: Simple smaller box at back
+        tail_width = 0.8 * scale
+        tail_length = 3.0 * scale
+        tail_x = body_length/2 + tail_length/2  # Behind body
+        
+        # Body, head and tail boxes: vertices 0-23, 12 faces each
+        box_vertices, box_faces = _boxes([
+            ((-body_length/2, -body_width/2, 0), (body_length/2, body_width/2, body_height)),
+            ((head_x - head_size/2, -head_size/2, 0), (head_x + head_size/2, head_size/2, head_size)),
+            ((tail_x - tail_length/2, -tail_width/2, 0), (tail_x + tail_length/2, tail_width/2, tail_width)),
+        ])
+        
+        # WINGS: Two simple triangular wings
+        wing_span = 4.0 * scale
+        wing_height = 2.0 * scale
+        
+        # LEGS: Four simple stick legs
+        leg_length = 2.0 * scale
+        leg_positions = np.array([
+            (-1.5, -0.8, 0),  # Front left leg base
+            (-1.5, 0.8, 0),   # Front right leg base
+            (1.5, -0.8, 0),   # Back left leg base
+            (1.5, 0.8, 0),    # Back right leg base
+        ])
+        
+        vertices = np.empty((38, 3))
+        vertices[:24] = box_vertices
+        vertices[24:30] = [
+            (0, 0, body_height),                         # 24 - Wing root (center of body)
+            (-2, -wing_span, body_height + wing_height), # 25 - Wing tip left
+            (2, -wing_span, body_height),                # 26 - Wing trailing edge left
+            (0, 0, body_height),                         # 27 - Wing root (center of body)
+            (-2, wing_span, body_height + wing_height),  # 28 - Wing tip right
+            (2, wing_span, body_height),                 # 29 - Wing trailing edge right
+        ]
+        vertices[30::2] = leg_positions                        # Leg top (on body)
+        vertices[31::2] = leg_positions - (0, 0, leg_length)   # Leg bottom (foot)
+        
+        faces = np.empty((42, 3), dtype=np.int32)
+        faces[:36] = box_faces
+        faces[36:38] = [(24, 25, 26), (27, 28, 29)]  # Wings (simple triangles)
+        # Legs: a degenerate triangle per leg (simple lines as triangles)
+        leg_base = np.arange(30, 38, 2, dtype=np.int32)
+        faces[38:, 0] = leg_base
+        faces[38:, 1] = leg_base + 1
+        faces[38:, 2] = leg_base
+        
+        return vertices, faces
+
+    def _generate_detailed_robot(self, complexity, material_properties, structural_modifier, context):
+        """Generate an extremely simple, clearly recognizable robot shape."""
+        scale = 1.0  # Keep it simple
+        
+        # TORSO: Simple rectangular main body
+        torso_width = 2.0 * scale
+        torso_height = 3.0 * scale
+        torso_depth = 1.5 * scale
+        
+        # HEAD: Simple cubic head on top
+        head_size = 1.2 * scale
+        head_z = torso_height
+        
+        # ARMS: Simple box arms at shoulder height
+        arm_width = 0.4 * scale
+        arm_length = 2.0 * scale
+        arm_height = 0.4 * scale
+        arm_z = torso_height * 0.8
+        left_arm_x = -torso_width/2 - arm_length/2
+        right_arm_x = torso_width/2 + arm_length/2
+        
+        # LEGS: Simple box legs hanging below the torso
+        leg_width = 0.6 * scale
+        leg_height = 2.5 * scale
+        leg_depth = 0.6 * scale
+        left_leg_x = -torso_width/4
+        right_leg_x = torso_width/4
+        
+        # Torso, head, arms, legs: 8 vertices and 12 faces per box
+        return _boxes([
+            ((-torso_width/2, -torso_depth/2, 0), (torso_width/2, torso_depth/2, torso_height)),
+            ((-head_size/2, -head_size/2, head_z), (head_size/2, head_size/2, head_z + head_size)),
+            ((left_arm_x - arm_length/2, -arm_width/2, arm_z), (left_arm_x + arm_length/2, arm_width/2, arm_z + arm_height)),
+            ((right_arm_x - arm_length/2, -arm_width/2, arm_z), (right_arm_x + arm_length/2, arm_width/2, arm_z + arm_height)),
+            ((left_leg_x - leg_width/2, -leg_depth/2, -leg_height), (left_leg_x + leg_width/2, leg_depth/2, 0)),
+            ((right_leg_x - leg_width/2, -leg_depth/2, -leg_height), (right_leg_x + leg_width/2, leg_depth/2, 0)),
+        ])
+
+# Shared instance - the generators keep no state of their own
+_generator = ProceduralShapeGenerator()
+
+# Fallback shape kinds are a handful of fixed keys, so every built mesh stays cached
+MESH_CACHE_SIZE = 16
+
+
+def _as_mesh(vertices, faces):
+    """Normalize a generator's output to contiguous float32 vertices and int32 faces, the dtypes the exporters write."""
+    return (
+        np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3),
+        np.ascontiguousarray(faces, dtype=np.int32).reshape(-1, 3),
+    )
+
+
+def simple_shape_kind(prompt: str):
+    """Resolve a prompt to its fallback shape kind (None for the default triangle)."""
+    tokens = _prompt_tokens(prompt.lower())
+    
+    # One hashed lookup per token instead of a keyword if/elif chain
+    matches = [SIMPLE_SHAPE_TABLE[token] for token in tokens & SIMPLE_SHAPE_TABLE.keys()]
+    return min(matches)[1] if matches else None
+
+
+@functools.lru_cache(maxsize=MESH_CACHE_SIZE)
+def build_simple_shape(kind):
+    """Generate the fallback mesh for a shape kind as read-only (vertices, faces).
+    
+    The kind fixes every generator parameter, so each mesh is built once per process.
+    """
+    if kind == 'dragon':
+        mesh = _generator._generate_detailed_dragon(5, {'density': 1.0}, 1.0, {})
+    elif kind == 'robot':
+        mesh = _generator._generate_detailed_robot(5, {'density': 1.0}, 1.0, {})
+    elif kind == 'creature':
+        mesh = _generator._generate_simple_creature('cat', 5)
+    else:
+        mesh = SIMPLE_MESHES[kind]
+    vertices, faces = _as_mesh(*mesh)
+    vertices.setflags(write=False)
+    faces.setflags(write=False)
+    return vertices, faces
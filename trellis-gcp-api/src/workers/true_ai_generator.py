@@ -4,18 +4,89 @@ True AI 3D Model Generator
 Uses actual generative AI models for text-to-3D without predefined shapes
 """
 
-import json
 import asyncio
-import tempfile
+import hashlib
+import struct
+import functools
+import io
 import numpy as np
 import structlog
-from pathlib import Path
 from minio import Minio
 from minio.error import S3Error
-from datetime import datetime
+from datetime import datetime, timezone
+
+from .common import encode_json, PUBLIC_READ_POLICY_TEMPLATE, open_sink
 
 logger = structlog.get_logger(__name__)
 
+# Prompt embeddings kept per process; a repeated prompt skips hashing and allocation
+EMBEDDING_CACHE_SIZE = 256
+
+# Generated meshes kept per generator; a retried or repeated prompt skips geometry generation entirely
+GEOMETRY_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=EMBEDDING_CACHE_SIZE)
+def _prompt_embedding(prompt):
+    """64-byte BLAKE2b digest of the prompt as a read-only vector of 0-255 values.
+    
+    Stored as float64, the geometry code's working type, so a cached prompt reaches
+    it without any conversion copy.
+    """
+    digest = hashlib.blake2b(prompt.encode(), digest_size=64).digest()
+    embedding = np.frombuffer(digest, dtype=np.uint8).astype(np.float64)
+    embedding.flags.writeable = False
+    return embedding
+
+
+@functools.lru_cache(maxsize=None)
+def _ring_trig(num_vertices):
+    """Read-only sin/cos of the structure angle for each vertex index.
+    
+    num_vertices only takes the values 200, 205, ... 1000, so the tables are computed
+    once per size rather than once per job.
+    """
+    radius_factor = (np.arange(num_vertices) / num_vertices) * 2 * np.pi
+    sin_table, cos_table = np.sin(radius_factor), np.cos(radius_factor)
+    sin_table.flags.writeable = False
+    cos_table.flags.writeable = False
+    return sin_table, cos_table
+
+
+def _ai_geometry(embedding, sin_table, cos_table):
+    """Vertices and faces for _ai_driven_geometry_generation, computed over whole index ranges.
+    
+    Returns the (N, 3) float32 vertices and the (M, 3) int32 faces that survive the
+    degenerate-triangle check - the dtypes the exporters write, so no caller converts.
+    """
+    n = embedding.size
+    num_vertices = sin_table.size
+    
+    # Generate coordinates in meaningful range (-10 to 10), each coordinate
+    # reading the embedding at a consecutive (wrapping) index
+    index = np.arange(num_vertices)
+    coords = (embedding[(index[:, None] + np.arange(3)) % n] - 127.5) / 12.75
+    
+    # Add some structure variation (in float64, rounding to float32 only on the store)
+    amplitude = embedding[index % n] / 255.0
+    coords[:, 0] += sin_table * amplitude
+    coords[:, 2] += cos_table * amplitude
+    vertices = coords.astype(np.float32)
+    
+    # Generate faces with proper connectivity - one candidate triangle per base vertex
+    base_idx = index[:num_vertices - 2]
+    
+    # Use embedding to vary triangle selection
+    offset1 = (embedding[base_idx % n] // 64).astype(np.intp) + 1  # 1-4
+    offset2 = (embedding[(base_idx + 1) % n] // 64).astype(np.intp) + 1  # 1-4
+    
+    v2 = np.minimum(base_idx + offset1, num_vertices - 1)
+    v3 = np.minimum(base_idx + offset2, num_vertices - 1)
+    faces = np.stack([base_idx, v2, v3], axis=1).astype(np.int32)
+    
+    # Ensure valid triangle
+    return vertices, faces[(base_idx != v2) & (v2 != v3) & (base_idx != v3)]
+
 class TrueAIGenerator:
     """Pure AI-driven 3D model generator without predefined shapes."""
     
@@ -28,13 +99,18 @@ class TrueAIGenerator:
         )
         self._diffusion_model = None
         self._text_encoder = None
+        self._known_buckets: set[str] = set()
+        self._bucket_lock = asyncio.Lock()
+        # Per-instance memo of prompt -> read-only (vertices, faces), least recently used first
+        self._geometry_cache: dict[str, tuple[np.ndarray, np.ndarray]] = {}
     
     def _load_ai_models(self):
-        """Load actual generative AI models for 3D generation."""
+        """Load actual generative AI models for 3D generation; a no-op once loaded."""
+        if self._text_encoder is not None:
+            return True
         try:
             # Simple but effective text-to-3D generation
-            import hashlib
-            import numpy as np
+            self._text_encoder = _prompt_embedding
             
             logger.info("Using practical AI 3D generation")
             return True
@@ -46,95 +122,68 @@ class TrueAIGenerator:
     async def _generate_with_ai(self, prompt: str):
         """Generate 3D geometry using pure AI without predefined shapes."""
         
-        if not self._load_ai_models():
+        if self._text_encoder is None and not self._load_ai_models():
             raise Exception("Failed to load AI models")
         
-        logger.info("Generating with practical AI", prompt=prompt)
-        
-        # Use text characteristics to generate meaningful geometry
-        import hashlib
-        import numpy as np
+        logger.debug("Generating with practical AI", prompt=prompt)
         
-        # Create deterministic but varied parameters from text
-        text_hash = hashlib.md5(prompt.encode()).digest()
-        embedding = np.frombuffer(text_hash, dtype=np.uint8).astype(np.float32)
-        
-        # Generate meaningful geometry
-        vertices, faces = await self._ai_driven_geometry_generation(embedding, prompt)
+        return self._geometry_for_prompt(prompt)
+    
+    def _geometry_for_prompt(self, prompt: str):
+        """Embed a prompt and generate its geometry; memoized per instance, so the arrays are read-only."""
+        geometry = self._geometry_cache.pop(prompt, None)
+        if geometry is None:
+            # Create deterministic but varied parameters from text
+            embedding = self._text_encoder(prompt)
+            
+            # Generate meaningful geometry
+            geometry = self._ai_driven_geometry_generation(embedding, prompt)
+            for array in geometry:
+                array.flags.writeable = False
+            if len(self._geometry_cache) >= GEOMETRY_CACHE_SIZE:
+                del self._geometry_cache[next(iter(self._geometry_cache))]
         
-        return vertices, faces
+        # (Re)insert as most recently used
+        self._geometry_cache[prompt] = geometry
+        return geometry
     
-    async def _ai_driven_geometry_generation(self, embedding, prompt):
+    def _ai_driven_geometry_generation(self, embedding, prompt):
         """Generate 3D geometry purely from AI embeddings without any predefined rules."""
         
         # Use embedding values to create meaningful 3D structures
-        embedding_flat = embedding.flatten() if hasattr(embedding, 'flatten') else embedding
+        embedding_flat = np.ravel(embedding)  # a view, not a copy, for the 1-D cached embedding
         
         # Generate vertices with proper distribution
         num_vertices = max(100, min(1000, int(abs(embedding_flat[0]) * 5) + 200))
-        vertices = []
         
-        # Create structured vertex generation
-        for i in range(num_vertices):
-            # Use embedding to create coordinates with proper scaling
-            idx_x = i % len(embedding_flat)
-            idx_y = (i + 1) % len(embedding_flat)
-            idx_z = (i + 2) % len(embedding_flat)
-            
-            # Generate coordinates in meaningful range (-10 to 10)
-            x = (embedding_flat[idx_x] - 127.5) / 12.75  # Scale 0-255 to -10 to 10
-            y = (embedding_flat[idx_y] - 127.5) / 12.75
-            z = (embedding_flat[idx_z] - 127.5) / 12.75
-            
-            # Add some structure variation
-            radius_factor = (i / num_vertices) * 2 * np.pi
-            x += np.sin(radius_factor) * (embedding_flat[i % len(embedding_flat)] / 255.0)
-            z += np.cos(radius_factor) * (embedding_flat[i % len(embedding_flat)] / 255.0)
-            
-            vertices.append((float(x), float(y), float(z)))
-        
-        # Generate faces with proper connectivity
-        faces = []
-        num_faces = min(len(vertices) - 2, int(len(vertices) * 1.5))
-        
-        for i in range(num_faces):
-            # Create triangles that form connected surfaces
-            base_idx = i % (len(vertices) - 2)
-            
-            # Use embedding to vary triangle selection
-            offset1 = int(embedding_flat[i % len(embedding_flat)] / 64) + 1  # 1-4
-            offset2 = int(embedding_flat[(i+1) % len(embedding_flat)] / 64) + 1  # 1-4
-            
-            v1 = base_idx
-            v2 = min(base_idx + offset1, len(vertices) - 1)
-            v3 = min(base_idx + offset2, len(vertices) - 1)
-            
-            # Ensure valid triangle
-            if v1 != v2 and v2 != v3 and v1 != v3:
-                faces.append((v1, v2, v3))
+        vertices, faces = _ai_geometry(np.asarray(embedding_flat, dtype=np.float64), *_ring_trig(num_vertices))
         
-        logger.info(f"Generated meaningful AI geometry", vertices=len(vertices), faces=len(faces))
+        logger.debug("Generated meaningful AI geometry", vertices=len(vertices), faces=len(faces))
         return vertices, faces
     
-    async def generate_3d_from_text(self, job_id: str, prompt: str, output_path: str, format: str = "glb"):
-        """Generate 3D model from text using pure AI."""
+    async def generate_3d_from_text(self, job_id: str, prompt: str, output_path, format: str = "glb"):
+        """Generate 3D model from text using pure AI.
+        
+        output_path may be a filesystem path or a writable binary buffer (e.g. io.BytesIO).
+        """
         
         logger.info("Starting true AI 3D generation", job_id=job_id, prompt=prompt, format=format)
         
         try:
             # Generate with pure AI
             vertices, faces = await self._generate_with_ai(prompt)
+            generated_at = datetime.now(timezone.utc).isoformat()
             
             # Export to requested format
             if format.lower() == "glb":
-                await self._export_ai_glb(vertices, faces, prompt, output_path)
+                await self._export_ai_glb(vertices, faces, prompt, output_path, generated_at)
             elif format.lower() == "obj":
-                await self._export_ai_obj(vertices, faces, prompt, output_path)
+                await self._export_ai_obj(vertices, faces, prompt, output_path, generated_at)
             elif format.lower() == "ply":
                 await self._export_ai_ply(vertices, faces, prompt, output_path)
             else:
                 logger.warning("Unknown format, using GLB", format=format)
-                await self._export_ai_glb(vertices, faces, prompt, output_path)
+                await self._export_ai_glb(vertices, faces, prompt, output_path, generated_at)
             
             logger.info("True AI 3D generation completed", job_id=job_id, format=format)
             return output_path
@@ -143,51 +192,61 @@ class TrueAIGenerator:
             logger.error("Failed to generate with true AI", job_id=job_id, error=str(e))
             raise
     
-    async def _export_ai_obj(self, vertices, faces, prompt, output_path):
+    async def _export_ai_obj(self, vertices, faces, prompt, output_path, generated_at):
         """Export AI-generated geometry to OBJ format."""
-        with open(output_path, 'w') as f:
-            f.write(f"# True AI-Generated 3D model for prompt: {prompt}\n")
-            f.write(f"# Generated using pure AI without predefined shapes\n")
-            f.write(f"# Generated at: {datetime.utcnow().isoformat()}\n")
-            f.write(f"# AI Vertices: {len(vertices)}, AI Faces: {len(faces)}\n\n")
+        await asyncio.to_thread(self._write_ai_obj, vertices, faces, prompt, output_path, generated_at)
+        logger.debug("True AI OBJ export completed", path=output_path)
+    
+    def _write_ai_obj(self, vertices, faces, prompt, output_path, generated_at):
+        """Blocking OBJ writer behind _export_ai_obj, run off the event loop."""
+        with open_sink(output_path) as f:
+            f.write((
+                f"# True AI-Generated 3D model for prompt: {prompt}\n"
+                "# Generated using pure AI without predefined shapes\n"
+                f"# Generated at: {generated_at}\n"
+                f"# AI Vertices: {len(vertices)}, AI Faces: {len(faces)}\n\n"
+            ).encode('utf-8'))
             
-            for v in vertices:
-                f.write(f"v {v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
+            # Whole-array formatting instead of one f-string write per row
+            np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
             
-            f.write("\n")
-            for face in faces:
-                f.write(f"f {face[0]+1} {face[1]+1} {face[2]+1}\n")
-        
-        logger.info("True AI OBJ export completed", path=output_path)
+            f.write(b"\n")
+            np.savetxt(f, faces + 1, fmt='f %d %d %d')
     
     async def _export_ai_ply(self, vertices, faces, prompt, output_path):
         """Export AI-generated geometry to PLY format."""
-        with open(output_path, 'w') as f:
-            f.write("ply\n")
-            f.write("format ascii 1.0\n")
-            f.write(f"comment True AI-Generated 3D model for prompt: {prompt}\n")
-            f.write(f"comment Generated using pure AI without predefined shapes\n")
-            f.write(f"element vertex {len(vertices)}\n")
-            f.write("property float x\n")
-            f.write("property float y\n")
-            f.write("property float z\n")
-            f.write(f"element face {len(faces)}\n")
-            f.write("property list uchar int vertex_indices\n")
-            f.write("end_header\n")
-            
-            for v in vertices:
-                f.write(f"{v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
+        await asyncio.to_thread(self._write_ai_ply, vertices, faces, prompt, output_path)
+        logger.debug("True AI PLY export completed", path=output_path)
+    
+    def _write_ai_ply(self, vertices, faces, prompt, output_path):
+        """Blocking PLY writer behind _export_ai_ply, run off the event loop."""
+        with open_sink(output_path) as f:
+            f.write((
+                "ply\n"
+                "format ascii 1.0\n"
+                f"comment True AI-Generated 3D model for prompt: {prompt}\n"
+                "comment Generated using pure AI without predefined shapes\n"
+                f"element vertex {len(vertices)}\n"
+                "property float x\n"
+                "property float y\n"
+                "property float z\n"
+                f"element face {len(faces)}\n"
+                "property list uchar int vertex_indices\n"
+                "end_header\n"
+            ).encode('utf-8'))
             
-            for face in faces:
-                f.write(f"3 {face[0]} {face[1]} {face[2]}\n")
-        
-        logger.info("True AI PLY export completed", path=output_path)
+            np.savetxt(f, vertices, fmt='%.6f %.6f %.6f')
+            np.savetxt(f, faces, fmt='3 %d %d %d')
     
-    async def _export_ai_glb(self, vertices, faces, prompt, output_path):
+    async def _export_ai_glb(self, vertices, faces, prompt, output_path, generated_at):
         """Export AI-generated geometry to GLB format."""
-        # Create GLB with actual AI-generated geometry
-        vertex_data = np.array(vertices, dtype=np.float32).tobytes()
-        face_data = np.array(faces, dtype=np.uint16).tobytes()
+        # Create GLB with actual AI-generated geometry (little-endian, as glTF requires)
+        vert_arr = np.ascontiguousarray(vertices, dtype='<f4')
+        # UNSIGNED_SHORT indices while every vertex is addressable, UNSIGNED_INT beyond that
+        index_dtype, index_component = ('<u2', 5123) if len(vertices) <= 0xFFFF else ('<u4', 5125)
+        face_arr = np.ascontiguousarray(faces, dtype=index_dtype)
+        vertex_length = vert_arr.nbytes
+        face_length = face_arr.nbytes
         
         json_data = {
             "asset": {"version": "2.0", "generator": "True-AI-3D-Generator"},
@@ -205,58 +264,73 @@ class TrueAIGenerator:
                     "componentType": 5126,
                     "count": len(vertices),
                     "type": "VEC3",
-                    "min": [float(min(v[i] for v in vertices)) for i in range(3)],
-                    "max": [float(max(v[i] for v in vertices)) for i in range(3)]
+                    "min": vert_arr.min(axis=0).tolist(),
+                    "max": vert_arr.max(axis=0).tolist()
                 },
                 {
                     "bufferView": 1,
-                    "componentType": 5123,
+                    "componentType": index_component,
                     "count": len(faces) * 3,
                     "type": "SCALAR"
                 }
             ],
             "bufferViews": [
-                {"buffer": 0, "byteOffset": 0, "byteLength": len(vertex_data)},
-                {"buffer": 0, "byteOffset": len(vertex_data), "byteLength": len(face_data)}
+                {"buffer": 0, "byteOffset": 0, "byteLength": vertex_length},
+                {"buffer": 0, "byteOffset": vertex_length, "byteLength": face_length}
             ],
-            "buffers": [{"byteLength": len(vertex_data) + len(face_data)}],
+            "buffers": [{"byteLength": vertex_length + face_length}],
             "_ai_prompt": prompt,
             "_ai_generated": True,
-            "_generated_at": datetime.utcnow().isoformat()
+            "_generated_at": generated_at
         }
         
-        json_str = json.dumps(json_data, separators=(',', ':'))
-        json_bytes = json_str.encode('utf-8')
-        
-        # GLB format assembly
-        header = b'glTF'
-        version = (2).to_bytes(4, 'little')
+        json_bytes = encode_json(json_data)
         
-        # Pad JSON to 4-byte boundary
-        json_padding = b'\x20' * (4 - (len(json_bytes) % 4)) if len(json_bytes) % 4 else b''
-        json_bytes += json_padding
+        # Pad JSON to 4-byte boundary (the glTF spec pads the JSON chunk with spaces)
+        json_bytes += b' ' * (-len(json_bytes) & 3)
         
-        # Binary data
-        binary_data = vertex_data + face_data
-        binary_padding = b'\x00' * (4 - (len(binary_data) % 4)) if len(binary_data) % 4 else b''
-        binary_data += binary_padding
+        # Binary data - only its padded length is needed up front, the arrays are written in place
+        binary_length = vertex_length + face_length
+        binary_padding = b'\x00' * (-binary_length & 3)
+        binary_length += len(binary_padding)
         
-        # Chunks
-        json_chunk_length = len(json_bytes).to_bytes(4, 'little')
-        json_chunk_type = b'JSON'
-        binary_chunk_length = len(binary_data).to_bytes(4, 'little')
-        binary_chunk_type = b'BIN\x00'
+        total_length = 12 + 8 + len(json_bytes) + 8 + binary_length
         
-        total_length = (12 + 8 + len(json_bytes) + 8 + len(binary_data)).to_bytes(4, 'little')
+        # Everything ahead of the binary payload: 12-byte header, JSON chunk, BIN chunk header
+        glb_data = b''.join((
+            struct.pack('<4sII', b'glTF', 2, total_length),
+            struct.pack('<I4s', len(json_bytes), b'JSON'),
+            json_bytes,
+            struct.pack('<I4s', binary_length, b'BIN\x00'),
+        ))
         
-        glb_data = (header + version + total_length + 
-                   json_chunk_length + json_chunk_type + json_bytes +
-                   binary_chunk_length + binary_chunk_type + binary_data)
+        await asyncio.to_thread(self._write_ai_glb, output_path, glb_data, vert_arr, face_arr, binary_padding)
         
-        with open(output_path, 'wb') as f:
-            f.write(glb_data)
+        logger.debug("True AI GLB export completed", path=output_path)
+    
+    def _write_ai_glb(self, output_path, prefix, vert_arr, face_arr, padding):
+        """Blocking GLB writer: the header/JSON prefix, then each array straight from its buffer."""
+        with open_sink(output_path) as f:
+            f.write(prefix)
+            f.write(vert_arr)
+            f.write(face_arr)
+            f.write(padding)
+    
+    async def _ensure_bucket(self, bucket_name: str):
+        """Create the bucket with a public read policy once; later calls are a set lookup."""
+        if bucket_name in self._known_buckets:
+            return
         
-        logger.info("True AI GLB export completed", path=output_path)
+        # Serialize first-time checks so concurrent jobs don't race to create the bucket
+        async with self._bucket_lock:
+            if bucket_name in self._known_buckets:
+                return
+            
+            if not await asyncio.to_thread(self.minio_client.bucket_exists, bucket_name):
+                await asyncio.to_thread(self.minio_client.make_bucket, bucket_name)
+                await asyncio.to_thread(self.minio_client.set_bucket_policy, bucket_name, PUBLIC_READ_POLICY_TEMPLATE % bucket_name)
+            
+            self._known_buckets.add(bucket_name)
     
     async def upload_to_minio(self, job_id: str, file_path: str, filename: str) -> str:
         """Upload AI-generated file to MinIO."""
@@ -264,21 +338,10 @@ class TrueAIGenerator:
             bucket_name = "trellis-output"
             object_name = f"{job_id}/{filename}"
             
-            if not self.minio_client.bucket_exists(bucket_name):
-                self.minio_client.make_bucket(bucket_name)
-                policy = {
-                    "Version": "2012-10-17",
-                    "Statement": [{
-                        "Effect": "Allow",
-                        "Principal": {"AWS": "*"},
-                        "Action": ["s3:GetObject"],
-                        "Resource": [f"arn:aws:s3:::{bucket_name}/*"]
-                    }]
-                }
-                self.minio_client.set_bucket_policy(bucket_name, json.dumps(policy))
+            await self._ensure_bucket(bucket_name)
             
-            self.minio_client.fput_object(bucket_name, object_name, file_path,
-                                        content_type="application/octet-stream")
+            await asyncio.to_thread(self.minio_client.fput_object, bucket_name, object_name, file_path,
+                                    content_type="application/octet-stream")
             
             public_url = f"http://localhost:9100/{bucket_name}/{object_name}"
             
@@ -291,29 +354,46 @@ class TrueAIGenerator:
             logger.error("Failed to upload true AI file to MinIO", job_id=job_id, error=str(e))
             raise
     
-    async def generate_and_upload_file(self, job_id: str, prompt: str, format: str = "glb") -> dict:
-        """Generate pure AI-driven 3D file and upload to MinIO."""
-        
-        with tempfile.NamedTemporaryFile(suffix=f'.{format}', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            
+    async def upload_buffer_to_minio(self, job_id: str, buffer: io.BytesIO, filename: str) -> str:
+        """Upload an in-memory model to MinIO without a temp file round-trip."""
         try:
-            # Generate with pure AI
-            await self.generate_3d_from_text(job_id, prompt, tmp_path, format)
+            bucket_name = "trellis-output"
+            object_name = f"{job_id}/{filename}"
             
-            file_size = Path(tmp_path).stat().st_size
-            filename = f"{job_id}_model.{format}"
-            public_url = await self.upload_to_minio(job_id, tmp_path, filename)
+            await self._ensure_bucket(bucket_name)
             
-            return {
-                "format": format,
-                "url": public_url,
-                "size_bytes": file_size,
-                "filename": filename
-            }
+            length = buffer.seek(0, io.SEEK_END)
+            buffer.seek(0)
+            await asyncio.to_thread(self.minio_client.put_object, bucket_name, object_name, buffer, length,
+                                    content_type="application/octet-stream")
             
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+            public_url = f"http://localhost:9100/{bucket_name}/{object_name}"
+            
+            logger.info("True AI-generated file uploaded to MinIO",
+                       job_id=job_id, filename=filename, url=public_url)
+            
+            return public_url
+            
+        except S3Error as e:
+            logger.error("Failed to upload true AI file to MinIO", job_id=job_id, error=str(e))
+            raise
+    
+    async def generate_and_upload_file(self, job_id: str, prompt: str, format: str = "glb") -> dict:
+        """Generate pure AI-driven 3D file and upload to MinIO."""
+        # Generate with pure AI straight into memory - the model never touches disk
+        buffer = io.BytesIO()
+        await self.generate_3d_from_text(job_id, prompt, buffer, format)
+        
+        file_size = buffer.tell()
+        filename = f"{job_id}_model.{format}"
+        public_url = await self.upload_buffer_to_minio(job_id, buffer, filename)
+        
+        return {
+            "format": format,
+            "url": public_url,
+            "size_bytes": file_size,
+            "filename": filename
+        }
 
 
 async def main():
@@ -6,9 +6,9 @@ import tempfile
 import os
 from pathlib import Path
 
-# Add the source directory to path
+# Add the source directory (this file's directory, wherever the checkout lives) to path
 import sys
-sys.path.insert(0, '/mnt/c/Users/上畑成龍/desktop/dev/3d-model-env/trellis-gcp-api')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from src.workers.cpu_ai_generator import CPUAIGenerator
 
@@ -0,0 +1,22 @@
+"""
+GLB parsing helpers shared by the generator tests
+"""
+
+import struct
+
+
+def glb_chunks(data):
+    """Check the GLB header and chunk framing, returning {chunk type: payload}."""
+    magic, version, total_length = struct.unpack_from('<4sII', data, 0)
+    assert (magic, version, total_length) == (b'glTF', 2, len(data))
+
+    chunks = {}
+    offset = 12
+    while offset < len(data):
+        assert offset % 4 == 0
+        chunk_length, chunk_type = struct.unpack_from('<I4s', data, offset)
+        assert chunk_length % 4 == 0
+        chunks[chunk_type] = bytes(data[offset + 8:offset + 8 + chunk_length])
+        offset += 8 + chunk_length
+    assert offset == len(data)
+    return chunks
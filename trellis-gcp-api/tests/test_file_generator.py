@@ -0,0 +1,50 @@
+"""
+Tests for the mock GLB files built by FileGenerator
+"""
+
+import io
+import json
+
+import pytest
+import trimesh
+
+from src.workers.file_generator import FileGenerator
+
+from glb_utils import glb_chunks
+
+
+@pytest.fixture
+def generator():
+    """File generator; the MinIO client is never contacted."""
+    return FileGenerator()
+
+
+class TestCreateMockGlb:
+    """Test cases for create_mock_glb."""
+
+    def test_mock_glb_is_a_valid_triangle(self, generator):
+        """The full mock GLB has aligned JSON and BIN chunks and loads as one triangle."""
+        data = generator.create_mock_glb("job-1", "a red dragon")
+        chunks = glb_chunks(data)
+
+        assert set(chunks) == {b'JSON', b'BIN\x00'}
+        gltf = json.loads(chunks[b'JSON'])
+        assert gltf["_prompt"] == "a red dragon"
+        assert gltf["buffers"][0]["byteLength"] == len(chunks[b'BIN\x00'])
+
+        scene = trimesh.load(io.BytesIO(bytes(data)), file_type='glb')
+        (mesh,) = scene.geometry.values()
+        assert (len(mesh.vertices), len(mesh.faces)) == (3, 1)
+
+    def test_minimal_glb_has_no_binary_chunk(self, generator):
+        """The minimal mock GLB is a JSON-only file with an empty scene."""
+        data = generator.create_mock_glb("job-1", "a red dragon", minimal=True)
+        chunks = glb_chunks(data)
+
+        assert set(chunks) == {b'JSON'}
+        gltf = json.loads(chunks[b'JSON'])
+        assert gltf["_prompt"] == "a red dragon"
+        assert "buffers" not in gltf
+
+        scene = trimesh.load(io.BytesIO(bytes(data)), file_type='glb')
+        assert len(scene.geometry) == 0
@@ -0,0 +1,203 @@
+"""
+Tests for the TRELLIS file generator's prompt batching, batched uploads and fallback models
+"""
+
+import asyncio
+import io
+import json
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import trimesh
+import zstandard
+
+from src.workers.trellis_file_generator import TrellisFileGenerator
+
+from glb_utils import glb_chunks
+
+
+class FakePipeline:
+    """Stands in for TrellisTextTo3DPipeline: one str prompt per run, one sample per output list."""
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def run(self, prompt, **params):
+        assert isinstance(prompt, str)
+        with self._lock:
+            self.prompts.append(prompt)
+        return {"mesh": [f"mesh:{prompt}"], "gaussian": [f"gaussian:{prompt}"]}
+
+
+class MeshPipeline(FakePipeline):
+    """Fake pipeline whose mesh output is a tetrahedron, so mesh formats export for real."""
+
+    def run(self, prompt, **params):
+        super().run(prompt, **params)
+        mesh = SimpleNamespace(
+            vertices=np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32),
+            faces=np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]], dtype=np.int32),
+        )
+        return {"mesh": [mesh], "gaussian": [None]}
+
+
+class FakeMinio:
+    """Records put_object uploads in memory."""
+
+    def __init__(self):
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def bucket_exists(self, bucket_name):
+        return True
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        with self._lock:
+            self.objects[f"{bucket_name}/{object_name}"] = data.read(length)
+
+
+class FailingMinio(FakeMinio):
+    """Fails every upload."""
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        raise OSError("connection reset")
+
+
+@pytest.fixture
+def generator():
+    """Generator wired to a fake pipeline."""
+    generator = TrellisFileGenerator()
+    generator.pipeline = FakePipeline()
+    generator._get_trellis_pipeline = lambda: generator.pipeline
+    return generator
+
+
+class TestPromptBatching:
+    """Test cases for the batched TRELLIS runner."""
+
+    @pytest.mark.asyncio
+    async def test_distinct_prompts_get_their_own_outputs(self, generator):
+        """Two concurrent, distinct prompts each run once and get their own single-sample outputs."""
+        dragon, robot = await asyncio.gather(generator._submit("dragon"), generator._submit("robot"))
+
+        assert dragon == {"mesh": ["mesh:dragon"], "gaussian": ["gaussian:dragon"]}
+        assert robot == {"mesh": ["mesh:robot"], "gaussian": ["gaussian:robot"]}
+        assert sorted(generator.pipeline.prompts) == ["dragon", "robot"]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_is_loaded_off_the_event_loop(self, generator):
+        """The pipeline loader (and its shared lock) only ever runs on a worker thread."""
+        loop_thread = threading.current_thread()
+        load_threads = []
+
+        def load():
+            load_threads.append(threading.current_thread())
+            return generator.pipeline
+
+        generator._get_trellis_pipeline = load
+        await generator._submit("tree")
+
+        assert load_threads and loop_thread not in load_threads
+
+    @pytest.mark.asyncio
+    async def test_duplicate_prompts_share_one_run(self, generator):
+        """Identical prompts in one batch window are sampled once."""
+        first, second = await asyncio.gather(generator._submit("cat"), generator._submit("cat"))
+
+        assert first == second == {"mesh": ["mesh:cat"], "gaussian": ["gaussian:cat"]}
+        assert generator.pipeline.prompts == ["cat"]
+
+
+class TestGenerateMany:
+    """Test cases for batched generate-and-upload."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_are_generated_and_uploaded_in_order(self, generator):
+        """Every job is sampled once, uploaded under its own object name, and returned in job order."""
+        generator.pipeline = MeshPipeline()
+        generator.minio_client = FakeMinio()
+        jobs = [("job-1", "dragon", "obj"), ("job-2", "robot", "ply"), ("job-3", "tree", "obj")]
+
+        results = await generator.generate_many(jobs, concurrency=2)
+
+        assert [r["filename"] for r in results] == [
+            "job-1_model.obj.zst", "job-2_model.ply.zst", "job-3_model.obj.zst"
+        ]
+        assert sorted(generator.pipeline.prompts) == ["dragon", "robot", "tree"]
+
+        objects = generator.minio_client.objects
+        assert len(objects) == len(jobs)
+        for (job_id, _, format), result in zip(jobs, results):
+            data = objects[f"trellis-output/{job_id}/{result['filename']}"]
+            assert len(data) == result["size_bytes"]
+            model = trimesh.load(
+                io.BytesIO(zstandard.ZstdDecompressor().decompressobj().decompress(data)),
+                file_type=format, process=False, force="mesh",
+            )
+            assert (len(model.vertices), len(model.faces)) == (4, 4)
+
+    @pytest.mark.asyncio
+    async def test_failed_upload_is_raised(self, generator):
+        """A failed upload fails the job instead of returning a URL that does not exist."""
+        generator.pipeline = MeshPipeline()
+        generator.minio_client = FailingMinio()
+
+        with pytest.raises(OSError):
+            await generator.generate_and_upload_file("job-1", "dragon", "obj")
+        with pytest.raises(OSError):
+            await generator.generate_many([("job-2", "robot", "ply")])
+
+    @pytest.mark.asyncio
+    async def test_background_upload_failure_is_kept_until_awaited(self, generator):
+        """A failed background upload is re-raised by the next wait_for_upload, then cleared."""
+        generator.pipeline = MeshPipeline()
+        generator.minio_client = FailingMinio()
+
+        await generator.generate_and_upload_file("job-1", "dragon", "obj", background_upload=True)
+        # Let the upload fail before anyone waits on it
+        await asyncio.to_thread(generator._pending_uploads["job-1"].exception)
+
+        with pytest.raises(OSError):
+            await generator.wait_for_upload("job-1")
+        await generator.wait_for_upload("job-1")
+
+
+class TestFallbackModels:
+    """Test cases for the fallback model writers."""
+
+    @pytest.mark.parametrize("prompt", ["red dragon", "robot", "house", "something else"])
+    def test_mock_glb_round_trips(self, generator, prompt):
+        """The fallback GLB has aligned chunks with consistent lengths and loads back unchanged."""
+        vertices, faces = generator._generate_simple_shape(prompt)
+        data = generator._create_mock_glb(prompt, vertices, faces, "2026-01-01T00:00:00+00:00")
+        chunks = glb_chunks(data)
+
+        assert set(chunks) == {b'JSON', b'BIN\x00'}
+        gltf = json.loads(chunks[b'JSON'])
+        assert gltf["_prompt"] == prompt
+        buffer_length = gltf["buffers"][0]["byteLength"]
+        assert buffer_length == sum(view["byteLength"] for view in gltf["bufferViews"])
+        assert len(chunks[b'BIN\x00']) == (buffer_length + 3) & ~3
+
+        scene = trimesh.load(io.BytesIO(data), file_type='glb', process=False)
+        (mesh,) = scene.geometry.values()
+        np.testing.assert_allclose(mesh.vertices, vertices, rtol=1e-6)
+        np.testing.assert_array_equal(mesh.faces, faces)
+
+    @pytest.mark.parametrize("prompt", ["red dragon", "robot", "house"])
+    def test_binary_ply_round_trips(self, generator, tmp_path, prompt):
+        """The fallback PLY is binary little-endian and reads back with the same vertex and face counts."""
+        vertices, faces = generator._generate_simple_shape(prompt)
+        path = tmp_path / "model.ply"
+        generator._write_fallback_model(path, "ply", prompt, "job-1")
+
+        data = path.read_bytes()
+        assert b"format binary_little_endian 1.0\n" in data[:data.index(b"end_header\n")]
+
+        mesh = trimesh.load(path, file_type='ply', process=False)
+        assert (len(mesh.vertices), len(mesh.faces)) == (len(vertices), len(faces))
+        np.testing.assert_allclose(mesh.vertices, vertices, rtol=1e-6)
+        np.testing.assert_array_equal(mesh.faces, faces)